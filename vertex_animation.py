@@ -34,28 +34,73 @@ bl_info = {
 
 import bpy
 import bmesh
-import warnings
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+try:
+    import OpenEXR
+    import Imath
+except ImportError:
+    OpenEXR = None
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
 
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _normalize_offsets(offsets, shift, scale):
+        """Shift and rescale a flat offsets buffer"""
+        for i in prange(offsets.size):
+            offsets[i] = (offsets[i] + shift) / scale
 
-def get_per_frame_mesh_data(context, data, objects):
+
+def get_per_frame_mesh_data(context, scene, data, objects, fast_frame_stepping=False):
     """Return a list of combined mesh data per frame"""
     meshes = []
-    for i in frame_range(context.scene):
-        context.scene.frame_set(i)
-        depsgraph = context.evaluated_depsgraph_get()
+    single_object = len(objects) == 1
+    wm = context.window_manager
+    frames = list(frame_range(scene))
+    wm.progress_begin(0, len(frames))
+    for progress, i in enumerate(frames):
+        if fast_frame_stepping:
+            scene.frame_current = i
+            depsgraph = context.evaluated_depsgraph_get()
+            depsgraph.update()
+        else:
+            scene.frame_set(i)
+            depsgraph = context.evaluated_depsgraph_get()
+        if single_object:
+            eval_object = objects[0].evaluated_get(depsgraph)
+            mesh = data.meshes.new_from_object(eval_object)
+            mesh.transform(objects[0].matrix_world)
+            mesh.update()
+            meshes.append(mesh)
+            wm.progress_update(progress + 1)
+            continue
         bm = bmesh.new()
         for ob in objects:
-            eval_object = ob.evaluated_get(depsgraph)
-            mesh = data.meshes.new_from_object(eval_object)
-            mesh.transform(ob.matrix_world)
-            bm.from_mesh(mesh)
-            data.meshes.remove(mesh)
+            vert_count = len(bm.verts)
+            bm.from_object(ob, depsgraph)
+            bm.verts.ensure_lookup_table()
+            bmesh.ops.transform(
+                bm, matrix=ob.matrix_world, verts=bm.verts[vert_count:]
+            )
         mesh = data.meshes.new("mesh")
-        bm.normal_update()
         bm.to_mesh(mesh)
         bm.free()
         mesh.update()
         meshes.append(mesh)
+        wm.progress_update(progress + 1)
+    wm.progress_end()
     return meshes
 
 
@@ -65,32 +110,47 @@ def create_export_mesh_object(context, data, me):
         me.uv_layers.new()
     uv_layer = me.uv_layers[1]
     uv_layer.name = "vertex_anim"
-    for loop in me.loops:
-        uv_layer.data[loop.index].uv = (
-            (loop.vertex_index + 0.5)/len(me.vertices), 128/255
-        )
+    loop_count = len(me.loops)
+    vertex_count = len(me.vertices)
+    vertex_indices = np.empty(loop_count, dtype=np.int32)
+    me.loops.foreach_get("vertex_index", vertex_indices)
+    uvs = np.empty((loop_count, 2), dtype=np.float32)
+    uvs[:, 0] = (vertex_indices + 0.5) / vertex_count
+    uvs[:, 1] = 128 / 255
+    uv_layer.data.foreach_set("uv", uvs.ravel())
     ob = data.objects.new("export_mesh", me)
     context.scene.collection.objects.link(ob)
     return ob
 
 
-def get_vertex_data(data, meshes):
-    """Return lists of vertex offsets and normals from a list of mesh data"""
-    original = meshes[0].vertices
-    offsets = []
-    normals = []
-    for mesh in reversed(meshes):
-        for vertex in mesh.vertices:
-            offset = vertex.co - original[vertex.index].co
-            x, y, z = offset
-            offsets.extend((x, y, z, 1.0))
-            x, y, z = vertex.normal
-            normals.extend(
-                (normalize_signed_to_zero_to_one_space(x),
-                 normalize_signed_to_zero_to_one_space(y),
-                normalize_signed_to_zero_to_one_space(z),
-                 1.0)
-            )
+def get_vertex_data(data, meshes, base_vertices=None):
+    """Return arrays of vertex offsets and normals from a list of mesh data"""
+    if base_vertices is None:
+        base_vertices = meshes[0].vertices
+    frame_count = len(meshes)
+    vertex_count = len(base_vertices)
+    base_co = np.empty(vertex_count * 3, dtype=np.float32)
+    base_vertices.foreach_get("co", base_co)
+    base_co = base_co.reshape(vertex_count, 3)
+    # offsets use an SoA (channel, frame, vertex) layout so the normalize
+    # pass never touches the constant alpha lane; channels interleave only
+    # at write time
+    offsets = np.empty((3, frame_count, vertex_count), dtype=np.float32)
+    normals = np.empty((frame_count, vertex_count, 4), dtype=np.uint8)
+    normals[..., 3] = 255
+    co = np.empty(vertex_count * 3, dtype=np.float32)
+    normal = np.empty(vertex_count * 3, dtype=np.float32)
+    for frame, mesh in enumerate(reversed(meshes)):
+        assert len(mesh.vertices) == vertex_count, \
+            "Baked frames must share the base frame's topology!"
+        mesh.vertices.foreach_get("co", co)
+        mesh.vertices.foreach_get("normal", normal)
+        offsets[:, frame] = (co.reshape(vertex_count, 3) - base_co).T
+        normals[frame, :, :3] = np.clip(
+            normalize_signed_to_zero_to_one_space(
+                normal.reshape(vertex_count, 3)
+            ) * 255.0, 0.0, 255.0
+        ).astype(np.uint8)
         if not mesh.users:
             data.meshes.remove(mesh)
     return offsets, normals
@@ -105,78 +165,219 @@ def frame_range(scene):
     return range(scene.frame_start, scene.frame_end+1, scene.frame_step)
 
 
+def bake_frames_parallel(context, jobs):
+    """Return vertex offsets and normals baked by background processes,
+    each evaluating a contiguous slice of the scene's frame range"""
+    frames = list(frame_range(context.scene))
+    jobs = max(1, min(jobs, len(frames)))
+    chunk_size = -(-len(frames) // jobs)
+    chunks = [frames[i:i + chunk_size] for i in range(0, len(frames), chunk_size)]
+    offsets = []
+    normals = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        processes = []
+        for index, chunk in enumerate(chunks):
+            out = os.path.join(temp_dir, f"slice_{index}")
+            stderr_file = open(out + "_stderr.log", "wb")
+            processes.append((out, stderr_file, subprocess.Popen([
+                bpy.app.binary_path, "--background", bpy.data.filepath,
+                # without this Blender exits 0 even when the worker
+                # script raises, hiding the failure from the parent
+                "--python-exit-code", "1",
+                "--python", os.path.abspath(__file__), "--",
+                "--start", str(chunk[0]), "--end", str(chunk[-1]),
+                "--base-frame", str(frames[0]), "--out", out,
+            ], stderr=stderr_file)))
+        # reap every worker before acting on failures, so none keep
+        # running against the temp dir after it is deleted
+        errors = []
+        for out, stderr_file, process in processes:
+            process.wait()
+            stderr_file.close()
+            failed = process.returncode != 0
+            if not failed and not (os.path.exists(out + "_offsets.npy")
+                                   and os.path.exists(out + "_normals.npy")):
+                failed = True
+            if failed:
+                with open(out + "_stderr.log", errors="replace") as log:
+                    stderr = log.read().strip()
+                errors.append(
+                    stderr.splitlines()[-1] if stderr else "see system console"
+                )
+        if errors:
+            raise RuntimeError(f"Parallel bake worker failed: {errors[0]}")
+        # get_vertex_data stores frames in reverse, so the slices are
+        # concatenated last to first to rebuild the full reversed range
+        for out, stderr_file, process in reversed(processes):
+            offsets.append(np.load(out + "_offsets.npy"))
+            normals.append(np.load(out + "_normals.npy"))
+    return np.concatenate(offsets, axis=1), np.concatenate(normals, axis=0)
+
+
+def parallel_bake_worker(argv):
+    """Bake one slice of the frame range to .npy files on disk,
+    run in a background Blender process by bake_frames_parallel"""
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--start", type=int, required=True)
+    parser.add_argument("--end", type=int, required=True)
+    parser.add_argument("--base-frame", type=int, required=True)
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args(argv)
+    context = bpy.context
+    data = bpy.data
+    scene = context.scene
+    objects = [ob for ob in context.selected_objects if ob.type == 'MESH']
+    scene.frame_start = scene.frame_end = args.base_frame
+    base_mesh = get_per_frame_mesh_data(context, scene, data, objects)[0]
+    scene.frame_start, scene.frame_end = args.start, args.end
+    meshes = get_per_frame_mesh_data(context, scene, data, objects)
+    offsets, normals = get_vertex_data(data, meshes, base_mesh.vertices)
+    if not base_mesh.users:
+        data.meshes.remove(base_mesh)
+    np.save(args.out + "_offsets.npy", offsets)
+    np.save(args.out + "_normals.npy", normals)
+
+
+def get_or_make_image(data, name, width, height, alpha=True, float_buffer=False):
+    """Return an existing image by name resized to fit, or a new one,
+    so repeat bakes reuse the allocation instead of growing the blend"""
+    image = data.images.get(name)
+    if image and image.is_float != float_buffer:
+        data.images.remove(image)
+        image = None
+    if image:
+        if tuple(image.size) != (width, height):
+            image.scale(width, height)
+        return image
+    return data.images.new(
+        name=name,
+        width=width,
+        height=height,
+        alpha=alpha,
+        float_buffer=float_buffer
+    )
+
+
+def offsets_export_name(offset_texture):
+    """Return an export file name with the baked offset range stamped in"""
+    neg = str(offset_texture["neg_max"]).replace(".", "_")
+    pos = str(offset_texture["pos_max"]).replace(".", "_")
+    return f"offsets_neg_max_{neg}_pos_max_{pos}"
+
+
 def bake_vertex_data(data, offsets, normals, size):
     """Stores vertex offsets and normals in separate image textures"""
     width, height = size
 
-    lowest_negative_offset = 0.0
-    highest_positive_offset = 0.0
-    for float_index in range(len(offsets)):
-        if float_index >= len(offsets) or (float_index +1) % 4 == 0:
-            continue
-        lowest_negative_offset = min(offsets[float_index], lowest_negative_offset)
-        highest_positive_offset = max(offsets[float_index], highest_positive_offset)
-
-    lowest_negative_offset *= -1
+    lowest_negative_offset = -min(float(offsets.min()), 0.0)
+    highest_positive_offset = max(float(offsets.max()), 0.0)
     neg_max_plus_pos_max = highest_positive_offset + lowest_negative_offset
     neg_max_plus_pos_max = 1 if neg_max_plus_pos_max == 0 else neg_max_plus_pos_max
 
-    for float_index in range(len(offsets)):
-        if float_index >= len(offsets) or (float_index +1) % 4 == 0:
-            continue
-        offsets[float_index] += lowest_negative_offset
-        offsets[float_index] /= neg_max_plus_pos_max
-
-    lno_str = str(lowest_negative_offset).replace(".", "_")
-
-    hpo_str = str(highest_positive_offset).replace(".", "_")
+    if njit is not None:
+        _normalize_offsets(
+            offsets.reshape(-1),
+            np.float32(lowest_negative_offset),
+            np.float32(neg_max_plus_pos_max)
+        )
+    else:
+        np.add(offsets, lowest_negative_offset, out=offsets)
+        np.divide(offsets, neg_max_plus_pos_max, out=offsets)
 
-    offset_texture = data.images.new(
-        name=f"offsets_neg_max_{lno_str}_pos_max_{hpo_str}" ,
-        width=width,
-        height=height,
-        alpha=True,
-        float_buffer=True
+    offset_texture = get_or_make_image(
+        data, "offsets", width, height, float_buffer=True
     )
-    normal_texture = data.images.new(
-        name="normals",
-        width=width,
-        height=height,
-        alpha=True
-    )
-
-    offset_texture.pixels = offsets
-    normal_texture.pixels = normals
+    normal_texture = get_or_make_image(data, "normals", width, height)
+    offset_texture["neg_max"] = lowest_negative_offset
+    offset_texture["pos_max"] = highest_positive_offset
+
+    offset_pixels = np.empty((height, width, 4), dtype=np.float32)
+    offset_pixels[..., :3] = offsets.transpose(1, 2, 0)
+    offset_pixels[..., 3] = 1.0
+    offset_texture.pixels.foreach_set(offset_pixels.ravel())
+    normal_pixels = normals.astype(np.float32).ravel()
+    np.divide(normal_pixels, 255.0, out=normal_pixels)
+    normal_texture.pixels.foreach_set(normal_pixels)
+    offset_texture.update()
+    normal_texture.update()
     return offset_texture, normal_texture
 
 import bpy
 import os
 
-def save_image_exr(image: bpy.types.Image):
+def export_filepath(base_name, ext=".exr"):
     """
-    Save a Blender Image as OpenEXR (RGBA, Float Full depth, Codec None, Non-Color)
-    into the folder containing the current .blend file, resolving name conflicts
-    by adding or incrementing a _N suffix.
+    Return a collision free export path for a given base name in the folder
+    containing the current .blend file, adding or incrementing a _N suffix
+    if the name is already taken.
 
-    :param image: The bpy.types.Image to save.
+    :param base_name: File name without extension.
+    :param ext: File extension including the leading dot.
     """
     # Ensure the .blend is saved
     blend_path = bpy.data.filepath
     if not blend_path:
-        raise RuntimeError("Please save your .blend file before calling save_image_exr().")
+        raise RuntimeError("Please save your .blend file before exporting images.")
     directory = os.path.dirname(blend_path)
 
-    # Base name (no extension) from image.name
-    base_name = image.name
-    ext = ".exr"
+    pattern = re.compile(
+        rf"^{re.escape(base_name)}(?:_(\d+))?{re.escape(ext)}$"
+    )
+    max_index = max(
+        (int(match.group(1) or 0)
+         for name in os.listdir(directory) if (match := pattern.match(name))),
+        default=-1
+    )
+    if max_index >= 0:
+        base_name = f"{base_name}_{max_index + 1}"
+    return os.path.join(directory, base_name + ext)
+
+
+def write_exr_direct(filepath, channels, half=False):
+    """
+    Write RGBA channel planes straight to an OpenEXR file with the OpenEXR
+    bindings, bypassing bpy.data.images and Blender's file writer.
 
-    full = os.path.join(directory, base_name + ext)
-    if os.path.exists(full):  # check existence :contentReference[oaicite:6]{index=6}
-        warnings.warn(
-            f"File '{full}' already exists; could not save image.",
-            UserWarning
-        )  # emit a warning :contentReference[oaicite:7]{index=7}
+    :param filepath: Destination .exr path.
+    :param channels: Iterable of four (height, width) float arrays, R, G, B, A.
+    :param half: Write 16-bit float channels instead of 32-bit.
+    """
+    r, g, b, a = channels
+    height, width = r.shape
+    pixel_type = Imath.PixelType(
+        Imath.PixelType.HALF if half else Imath.PixelType.FLOAT
+    )
+    dtype = np.float16 if half else np.float32
+    header = OpenEXR.Header(width, height)
+    header["channels"] = {
+        name: Imath.Channel(pixel_type) for name in ("R", "G", "B", "A")
+    }
+    out = OpenEXR.OutputFile(filepath, header)
+    try:
+        # image.pixels rows start at the bottom, EXR scanlines at the top
+        out.writePixels({
+            name: np.ascontiguousarray(plane[::-1], dtype=dtype).tobytes()
+            for name, plane in zip("RGBA", (r, g, b, a))
+        })
+    finally:
+        out.close()
+    print(f"Image saved as '{os.path.basename(filepath)}'")
+
+
+def save_image_exr(image: bpy.types.Image, halfdepth=False, base_name=None):
+    """
+    Save a Blender Image as OpenEXR (RGBA, Float Full depth, Codec None, Non-Color)
+    into the folder containing the current .blend file, resolving name conflicts
+    by adding or incrementing a _N suffix.
 
+    :param image: The bpy.types.Image to save.
+    :param halfdepth: Write 16-bit float channels (ZIP codec) instead of 32-bit.
+    :param base_name: File name without extension; defaults to the image name.
+    """
+    if base_name is None:
+        base_name = image.name
+    full = export_filepath(base_name)
 
     temp_scene = bpy.data.scenes.new(name=base_name)
 
@@ -184,8 +385,9 @@ def save_image_exr(image: bpy.types.Image):
     ims = temp_scene.render.image_settings
     ims.file_format = 'OPEN_EXR'
     ims.color_mode = 'RGBA'
-    ims.color_depth = '32'
-    ims.exr_codec = 'NONE'
+    ims.color_depth = '16' if halfdepth else '32'
+    ims.exr_codec = 'ZIP' if halfdepth else 'NONE'
+    image.use_half_precision = halfdepth
 
     # Create a context override so the operator knows which image to save
     image.save_render(full, scene=temp_scene)
@@ -203,35 +405,53 @@ class OBJECT_OT_ProcessAnimMeshes(bpy.types.Operator):
     bl_idname = "object.process_anim_meshes"
     bl_label = "Process Anim Meshes"
 
-    @property
-    def allowed_modifiers(self):
-        return [
-            'ARMATURE', 'CAST', 'CURVE', 'DISPLACE', 'HOOK',
-            'LAPLACIANDEFORM', 'LATTICE', 'MESH_DEFORM',
-            'SHRINKWRAP', 'SIMPLE_DEFORM', 'SMOOTH',
-            'CORRECTIVE_SMOOTH', 'LAPLACIANSMOOTH',
-            'SURFACE_DEFORM', 'WARP', 'WAVE',
-        ]
+    parallel_jobs: bpy.props.IntProperty(
+        name="Parallel Jobs",
+        description="Number of background Blender processes to bake frame"
+                    " slices on; 1 bakes in this process",
+        default=1,
+        min=1,
+        max=64
+    )
+    fast_frame_stepping: bpy.props.BoolProperty(
+        name="Fast Frame Stepping",
+        description="Step frames by assigning frame_current and updating the"
+                    " depsgraph directly, skipping frame change handlers;"
+                    " disable for handler driven rigs",
+        default=False
+    )
+
+    ALLOWED_MODIFIERS = frozenset({
+        'ARMATURE', 'CAST', 'CURVE', 'DISPLACE', 'HOOK',
+        'LAPLACIANDEFORM', 'LATTICE', 'MESH_DEFORM',
+        'SHRINKWRAP', 'SIMPLE_DEFORM', 'SMOOTH',
+        'CORRECTIVE_SMOOTH', 'LAPLACIANSMOOTH',
+        'SURFACE_DEFORM', 'WARP', 'WAVE',
+    })
 
     @classmethod
     def poll(cls, context):
         ob = context.active_object
-        return ob and ob.type == 'MESH' and ob.mode == 'OBJECT'
+        if not (ob and ob.type == 'MESH' and ob.mode == 'OBJECT'):
+            return False
+        for ob in context.selected_objects:
+            if ob.type != 'MESH':
+                continue
+            for mod in ob.modifiers:
+                if mod.type not in cls.ALLOWED_MODIFIERS:
+                    cls.poll_message_set(
+                        f"Objects with {mod.type.title()} modifiers are not allowed!"
+                    )
+                    return False
+        return True
 
     def execute(self, context):
-        units = context.scene.unit_settings
+        scene = context.scene
+        units = scene.unit_settings
         data = bpy.data
         objects = [ob for ob in context.selected_objects if ob.type == 'MESH']
         vertex_count = sum([len(ob.data.vertices) for ob in objects])
-        frame_count = len(frame_range(context.scene))
-        for ob in objects:
-            for mod in ob.modifiers:
-                if mod.type not in self.allowed_modifiers:
-                    self.report(
-                        {'ERROR'},
-                        f"Objects with {mod.type.title()} modifiers are not allowed!"
-                    )
-                    return {'CANCELLED'}
+        frame_count = len(frame_range(scene))
         if units.system != 'METRIC' or round(units.scale_length, 2) != 0.01:
             self.report(
                 {'ERROR'},
@@ -250,14 +470,75 @@ class OBJECT_OT_ProcessAnimMeshes(bpy.types.Operator):
                 f"Frame count of {frame_count :,}, exceeds limit of 8,192!"
             )
             return {'CANCELLED'}
-        meshes = get_per_frame_mesh_data(context, data, objects)
+        parallel = self.parallel_jobs > 1
+        if parallel and (not bpy.data.filepath or bpy.data.is_dirty):
+            self.report(
+                {'ERROR'},
+                "Save the .blend file, including unsaved changes, before"
+                " baking with Parallel Jobs!"
+            )
+            return {'CANCELLED'}
+        if parallel:
+            frame_end = scene.frame_end
+            scene.frame_end = scene.frame_start
+            meshes = get_per_frame_mesh_data(
+                context, scene, data, objects, self.fast_frame_stepping
+            )
+            scene.frame_end = frame_end
+        else:
+            meshes = get_per_frame_mesh_data(
+                context, scene, data, objects, self.fast_frame_stepping
+            )
         export_mesh_data = meshes[0].copy()
         create_export_mesh_object(context, data, export_mesh_data)
-        offsets, normals = get_vertex_data(data, meshes)
+        if parallel:
+            try:
+                offsets, normals = bake_frames_parallel(
+                    context, self.parallel_jobs
+                )
+            except RuntimeError as error:
+                for mesh in meshes:
+                    if not mesh.users:
+                        data.meshes.remove(mesh)
+                self.report({'ERROR'}, str(error))
+                return {'CANCELLED'}
+            for mesh in meshes:
+                if not mesh.users:
+                    data.meshes.remove(mesh)
+        else:
+            offsets, normals = get_vertex_data(data, meshes)
         texture_size = vertex_count, frame_count
         offsets_texture, normals_texture = bake_vertex_data(data, offsets, normals, texture_size)
-        save_image_exr(offsets_texture)
-        save_image_exr(normals_texture)
+        if OpenEXR is not None:
+            # OpenEXR releases the GIL while encoding, so the two writes
+            # can overlap; the bpy fallback below touches bpy.data and
+            # must stay on the main thread
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                writes = [
+                    executor.submit(
+                        write_exr_direct,
+                        export_filepath(offsets_export_name(offsets_texture)),
+                        # the SoA planes are already the EXR channel layout
+                        [offsets[0], offsets[1], offsets[2],
+                         np.ones_like(offsets[0])],
+                        True
+                    ),
+                    executor.submit(
+                        write_exr_direct,
+                        export_filepath(normals_texture.name),
+                        [normals[..., i].astype(np.float32) / 255.0
+                         for i in range(4)]
+                    ),
+                ]
+                for write in writes:
+                    write.result()
+        else:
+            save_image_exr(
+                offsets_texture,
+                halfdepth=True,
+                base_name=offsets_export_name(offsets_texture)
+            )
+            save_image_exr(normals_texture)
 
         return {'FINISHED'}
 
@@ -294,4 +575,7 @@ def unregister():
 
 
 if __name__ == "__main__":
-    register()
+    if "--" in sys.argv:
+        parallel_bake_worker(sys.argv[sys.argv.index("--") + 1:])
+    else:
+        register()